@@ -14,6 +14,8 @@ printer = NetworkPrinter(host="192.168.0.100", port=9100, timeout=5, autoclose=T
 
 
 def demo_print():
+    printer.begin_job()
+
     printer.set(align='left', height=2, width=2, custom_size=True)
     printer.text_ln('Demo network-escpos')
     printer.ln(count=2)
@@ -27,6 +29,8 @@ def demo_print():
 
     printer.cut(mode='FULL')
 
+    printer.end_job()
+
 
 if __name__ == '__main__':
     demo_print()
\ No newline at end of file
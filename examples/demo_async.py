@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+    Async demo
+    ~~~~~
+    Python network esc/pos printer API demo, printing to several printers at once.
+    :copyright: (c) 2021 by WeRn <wern@lightning-digital.org>.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import asyncio
+
+from network_escpos import AsyncNetworkPrinter
+
+
+HOSTS = ["192.168.0.100", "192.168.0.101"]
+
+
+async def demo_print(host):
+    async with AsyncNetworkPrinter(host=host, port=9100, timeout=5) as printer:
+        printer.set(align='center', width=2, height=2, custom_size=True)
+        printer.text_ln('Demo network-escpos')
+        printer.ln()
+
+        printer.set(align='left')
+        printer.text_lines(['Printed on {}'.format(host), 'Test success!'])
+
+        await printer.cut(mode='FULL')
+
+
+async def main():
+    await asyncio.gather(*(demo_print(host) for host in HOSTS))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
\ No newline at end of file
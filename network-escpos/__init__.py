@@ -9,73 +9,122 @@
 
 __version__ = '1.0.1'
 
+import asyncio
+import codecs
+import functools
 import socket
-import time
-
-import six
 
 from commands import PAPER_FULL_CUT, PAPER_PART_CUT
 from commands import RT_STATUS_ONLINE, RT_MASK_ONLINE
 from commands import RT_STATUS_PAPER, RT_MASK_PAPER, RT_MASK_LOWPAPER, RT_MASK_NOPAPER
-from commands import SET_FONT
+from commands import TXT_FONT_A, TXT_FONT_B
 from commands import TXT_SIZE, TXT_NORMAL
 from commands import TXT_STYLE
 
+# Large enough for a whole receipt, so flush() returns once it is copied to the kernel,
+# close() does not wait either: the kernel finishes sending in the background
+_SNDBUF = 1024 * 1024
+
+# Most fragments passed to a single sendmsg call (IOV_MAX on Linux and macOS)
+_IOV_MAX = 1024
+
+# Paper feed before the cut, so the last line clears the cutter
+# TODO: handle this with a line feed
+_FEED_FULL_CUT = b"\n\n\n\n\n\n" + PAPER_FULL_CUT
+_FEED_PART_CUT = b"\n\n\n\n\n\n" + PAPER_PART_CUT
+
+# Font commands keyed by name or index
+_FONTS = {"a": TXT_FONT_A, "b": TXT_FONT_B, 0: TXT_FONT_A, 1: TXT_FONT_B}
+
+# Boolean styles as tuples, indexed by the flag itself
+_FLIP = (TXT_STYLE["flip"][False], TXT_STYLE["flip"][True])
+_SMOOTH = (TXT_STYLE["smooth"][False], TXT_STYLE["smooth"][True])
+_BOLD = (TXT_STYLE["bold"][False], TXT_STYLE["bold"][True])
+_INVERT = (TXT_STYLE["invert"][False], TXT_STYLE["invert"][True])
+
+# Custom size commands keyed by (width, height)
+_SIZE_BYTES = {
+    (width, height): TXT_SIZE + bytes((TXT_STYLE["width"][width] + TXT_STYLE["height"][height],))
+    for width in TXT_STYLE["width"]
+    for height in TXT_STYLE["height"]
+}
+
+# Size mode commands keyed by (double_width, double_height)
+_SIZE_MODES = {
+    (False, False): TXT_NORMAL + TXT_STYLE["size"]["normal"],
+    (True, False): TXT_NORMAL + TXT_STYLE["size"]["2w"],
+    (False, True): TXT_NORMAL + TXT_STYLE["size"]["2h"],
+    (True, True): TXT_NORMAL + TXT_STYLE["size"]["2x"],
+}
+
+
+# typed, so that e.g. width=2.0 is not served the cached result of width=2
+@functools.lru_cache(maxsize=64, typed=True)
+def _build_set_bytes(align, font, bold, underline, width, height, density, invert, smooth, flip,
+                     double_width, double_height, custom_size):
+    """Build the commands for :py:meth:`NetworkPrinter.set`, see there for the parameters
+    :rtype: bytes
+    """
+    buf = bytearray()
 
-class NetworkPrinter(object):
-    """Network printer
+    if custom_size:
+        # Floats would find a key too, as 2.0 hashes like 2
+        if not (isinstance(width, int) and isinstance(height, int) and (width, height) in _SIZE_BYTES):
+            raise ValueError("Width and height must be integers from 1 to 8")
+        buf += _SIZE_BYTES[(width, height)]
+    else:
+        buf += _SIZE_MODES[(bool(double_width), bool(double_height))]
+
+    buf += _FLIP[flip]
+    buf += _SMOOTH[smooth]
+    buf += _BOLD[bold]
+    buf += TXT_STYLE["underline"][underline]
+    try:
+        buf += _FONTS[font]
+    except KeyError:
+        raise ValueError("Font must be 'a', 'b', 0 or 1")
+    buf += TXT_STYLE["align"][align]
+
+    if density != 9:
+        buf += TXT_STYLE["density"][density]
+
+    buf += _INVERT[invert]
+
+    return bytes(buf)
+
+
+class _BasePrinter(object):
+    """ESC/POS commands shared by :py:class:`NetworkPrinter` and :py:class:`AsyncNetworkPrinter`
+
+    Commands are only queued here, the subclasses send them on ``flush()``.
     """
 
     host: str
     port: int
     timeout: int
-    device: socket
     codepage: str
 
-    def __init__(self, host: str, port: int = 9100, timeout: int = 30, autoclose: bool = True, codepage: str = 'cp866'):
+    def __init__(self, host: str, port: int, timeout: int, codepage: str):
         """
         :param host:    Printer's hostname or IP address
         :param port:    Port to write to
-        :param timeout: Timeout in seconds for the socket-library
-        :param autoclose: Automatic closing of the printer connection
-        :param codepage: Default: cp866
+        :param timeout: Timeout in seconds for the connection
+        :param codepage: Encoding of the printed text
         """
         self.host = host
         self.port = port
         self.timeout = timeout
-        self.autoclose = autoclose
         self.codepage = codepage
-        self.open()
-
-    def open(self):
-        """Open TCP socket with ``socket``-library and set it as escpos device"""
-        self.device = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.device.settimeout(self.timeout)
-        self.device.connect((self.host, self.port))
-
-        if self.device is None:
-            print("Could not open socket for {0}".format(self.host))
+        self._frags = []
+        self._encoder = codecs.getencoder(codepage)
+        self._nl = self._encoder("\n")[0]
 
     def _raw(self, msg):
-        """Print any command sent in raw format
+        """Queue any command in raw format, it is sent on the next :py:meth:`flush`
         :param msg: arbitrary code to be printed
         :type msg: bytes
         """
-        self.device.sendall(msg)
-
-    def _read(self):
-        """Read data from the TCP socket"""
-
-        return self.device.recv(16)
-
-    def close(self):
-        """Close TCP connection"""
-        if self.device is not None:
-            try:
-                self.device.shutdown(socket.SHUT_RDWR)
-            except socket.error:
-                pass
-            self.device.close()
+        self._frags.append(msg)
 
     def set(self, align="left", font="a", bold=False, underline=0, width=1, height=1, density=9, invert=False, smooth=False,
             flip=False, double_width=False, double_height=False, custom_size=False):
@@ -112,39 +161,12 @@ class NetworkPrinter(object):
         :type width: int
         :type height: int
         :type density: int
+        :raises: :py:exc:`ValueError` if custom_size is used with width or height not an integer from 1-8,
+            or for an unknown font
         """
 
-        if custom_size:
-            if (
-                1 <= width <= 8
-                and 1 <= height <= 8
-                and isinstance(width, int)
-                and isinstance(height, int)
-            ):
-                size_byte = TXT_STYLE["width"][width] + TXT_STYLE["height"][height]
-                self._raw(TXT_SIZE + six.int2byte(size_byte))
-        else:
-            self._raw(TXT_NORMAL)
-            if double_width and double_height:
-                self._raw(TXT_STYLE["size"]["2x"])
-            elif double_width:
-                self._raw(TXT_STYLE["size"]["2w"])
-            elif double_height:
-                self._raw(TXT_STYLE["size"]["2h"])
-            else:
-                self._raw(TXT_STYLE["size"]["normal"])
-
-        self._raw(TXT_STYLE["flip"][flip])
-        self._raw(TXT_STYLE["smooth"][smooth])
-        self._raw(TXT_STYLE["bold"][bold])
-        self._raw(TXT_STYLE["underline"][underline])
-        self._raw(SET_FONT(six.int2byte(1)))
-        self._raw(TXT_STYLE["align"][align])
-
-        if density != 9:
-            self._raw(TXT_STYLE["density"][density])
-
-        self._raw(TXT_STYLE["invert"][invert])
+        self._raw(_build_set_bytes(align, font, bold, underline, width, height, density, invert, smooth, flip,
+                                   double_width, double_height, custom_size))
 
     def text(self, txt: str):
         """ Print text
@@ -154,7 +176,7 @@ class NetworkPrinter(object):
 
         :param txt: text to be printed
         """
-        self._raw(txt.encode(self.codepage))
+        self._raw(self._encoder(txt)[0])
 
     def text_ln(self, txt: str):
         """Print text with a newline
@@ -162,7 +184,24 @@ class NetworkPrinter(object):
         The input text has to be encoded in unicode.
         :param txt: text to be printed with a newline
         """
-        self.text("{}\n".format(txt))
+        self._raw(self._encoder(txt)[0] + self._nl)
+
+    def text_lines(self, lines, sep: str = "\n"):
+        """Print several lines of text at once
+        All lines are encoded in one go and queued as a single command.
+        :param lines: iterable of texts, each printed followed by ``sep``
+        :param sep: line separator, *default*: newline
+        """
+        self._raw(self._encoder("".join(line + sep for line in lines))[0])
+
+    def print_rows(self, rows):
+        """Print several lines of text, each with its own text properties
+        :param rows: iterable of ``(style, text)`` pairs, where ``style`` is a dict of
+            keyword arguments for :py:meth:`set`
+        """
+        for style, txt in rows:
+            self.set(**style)
+            self.text_ln(txt)
 
     def ln(self, count: int = 1):
         """Print a newline or more
@@ -172,7 +211,191 @@ class NetworkPrinter(object):
         if count < 0:
             raise ValueError("Count cannot be lesser than 0")
         if count > 0:
-            self.text("\n" * count)
+            self._raw(self._nl * count)
+
+    def _queue_cut(self, mode: str):
+        """Queue the paper feed and cut command, see :py:meth:`NetworkPrinter.cut`"""
+        if mode.upper() == "PART":
+            self._raw(_FEED_PART_CUT)
+        else:  # DEFAULT MODE: FULL CUT
+            self._raw(_FEED_FULL_CUT)
+
+    @staticmethod
+    def _online_status(status):
+        """Decode the reply to RT_STATUS_ONLINE, see :py:meth:`NetworkPrinter.is_online`"""
+        if len(status) == 0:
+            return False
+        return not (status[0] & RT_MASK_ONLINE)
+
+    @staticmethod
+    def _paper_status(status):
+        """Decode the reply to RT_STATUS_PAPER, see :py:meth:`NetworkPrinter.paper_status`"""
+        if len(status) == 0:
+            return 2
+        if status[0] & RT_MASK_NOPAPER == RT_MASK_NOPAPER:
+            return 0
+        if status[0] & RT_MASK_LOWPAPER == RT_MASK_LOWPAPER:
+            return 1
+        if status[0] & RT_MASK_PAPER == RT_MASK_PAPER:
+            return 2
+
+
+class NetworkPrinter(_BasePrinter):
+    """Network printer
+    """
+
+    device: socket
+
+    # Idle connections kept by close() for reuse, keyed by (host, port)
+    _pool = {}
+
+    def __init__(self, host: str, port: int = 9100, timeout: int = 30, autoclose: bool = True, codepage: str = 'cp866'):
+        """
+        :param host:    Printer's hostname or IP address
+        :param port:    Port to write to
+        :param timeout: Timeout in seconds for the socket-library
+        :param autoclose: Automatic closing of the printer connection. When disabled, :py:meth:`close`
+            keeps the connection open for the next printer on the same host and port
+        :param codepage: Default: cp866
+        """
+        super(NetworkPrinter, self).__init__(host, port, timeout, codepage)
+        self.autoclose = autoclose
+        self._corked = False
+        self.open()
+
+    def open(self):
+        """Open TCP socket with ``socket``-library and set it as escpos device
+
+        An idle connection to the same host and port left by :py:meth:`close` is reused if it is still up.
+
+        :raises: :py:exc:`socket.error` if the printer cannot be reached
+        """
+        device = self._pool.pop((self.host, self.port), None)
+        if device is not None:
+            if self._is_alive(device):
+                device.settimeout(self.timeout)
+                self.device = device
+                return
+            device.close()
+
+        self.device = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Commands are batched by flush(), so Nagle would only delay them
+        self.device.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.device.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SNDBUF)
+        self.device.settimeout(self.timeout)
+        self.device.connect((self.host, self.port))
+
+    def _send(self, frags):
+        """Write data to the TCP socket, this is the only place where print data leaves the process
+
+        The fragments are passed to ``sendmsg`` as they are, without joining them first.
+        Platforms without ``sendmsg`` (Windows) get a single joined ``sendall``.
+        :param frags: list of fragments to write, consumed in place; on error it keeps only the unsent data
+        :type frags: list(bytes)
+        """
+        if not hasattr(self.device, "sendmsg"):
+            self.device.sendall(b"".join(frags))
+            return
+
+        i = 0
+        try:
+            while i < len(frags):
+                sent = self.device.sendmsg(frags[i:i + _IOV_MAX])
+                # Skip the fragments written completely and keep the rest of a partly written one
+                while i < len(frags) and sent >= len(frags[i]):
+                    sent -= len(frags[i])
+                    i += 1
+                if sent:
+                    frags[i] = memoryview(frags[i])[sent:]
+        finally:
+            # Even on error, what was written must not be sent again by the next flush
+            del frags[:i]
+
+    def flush(self):
+        """Send all queued commands to the printer in a single write"""
+        if self._frags:
+            self._send(self._frags)
+            self._frags.clear()
+
+    def begin_job(self):
+        """Start a print job
+
+        Until :py:meth:`end_job` is called the kernel holds back partial TCP segments
+        (``TCP_CORK``), so intermediate flushes go out as full-sized segments.
+        Has no effect on platforms without ``TCP_CORK``.
+        """
+        if hasattr(socket, "TCP_CORK"):
+            self.device.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+            self._corked = True
+
+    def end_job(self):
+        """Finish a print job started with :py:meth:`begin_job` and send everything still pending"""
+        self.flush()
+        self._uncork()
+
+    def _uncork(self):
+        """Release TCP segments held back since :py:meth:`begin_job`"""
+        if self._corked:
+            self.device.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+            self._corked = False
+
+    def _read(self):
+        """Read data from the TCP socket"""
+
+        return self.device.recv(16)
+
+    @staticmethod
+    def _is_alive(device):
+        """Check that an idle connection is still open and has nothing left to read"""
+        try:
+            device.setblocking(False)
+            device.recv(1, socket.MSG_PEEK)
+        except BlockingIOError:
+            return True
+        except socket.error:
+            return False
+        # Either the printer closed the connection or stale data is waiting
+        return False
+
+    @staticmethod
+    def _shutdown(device):
+        """Shut down and close a TCP connection"""
+        try:
+            device.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        device.close()
+
+    def close(self):
+        """Send the queued commands, then close TCP connection, or keep it for reuse if ``autoclose`` is disabled
+
+        A connection is only kept for reuse if the queued commands were sent without error.
+        Closing does not wait for the printer to take the data still in the socket's send
+        buffer, the kernel keeps sending it in the background.
+        A print job left open by :py:meth:`begin_job` is ended first, so the connection
+        is never handed on with ``TCP_CORK`` still set.
+        """
+        if self.device is not None:
+            key = (self.host, self.port)
+            reuse = False
+            try:
+                self.flush()
+                self._uncork()
+                reuse = not self.autoclose and key not in self._pool
+            finally:
+                if reuse:
+                    self._pool[key] = self.device
+                else:
+                    self._shutdown(self.device)
+                self.device = None
+                self._corked = False
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Close all idle connections kept for reuse"""
+        while cls._pool:
+            _, device = cls._pool.popitem()
+            cls._shutdown(device)
 
     def cut(self, mode: str):
         """ Cut paper.
@@ -181,29 +404,38 @@ class NetworkPrinter(object):
         be attempted. Note however, that not all models can do a partial cut. See the documentation of
         your printer for details.
 
+        The cut ends the print job, so everything queued so far is flushed to the printer.
+
         .. todo:: Check this function on TM-T88II.
 
         :param mode: set to 'PART' for a partial cut
         """
-        # Fix the size between last line and cut
-        # TODO: handle this with a line feed
-        self._raw(b"\n\n\n\n\n\n")
-        if mode.upper() == "PART":
-            self._raw(PAPER_PART_CUT)
-        else:  # DEFAULT MODE: FULL CUT
-            self._raw(PAPER_FULL_CUT)
+        self._queue_cut(mode)
+        self.flush()
 
-    def query_status(self, mode):
+    def query_status(self, mode, timeout: float = 1.0):
         """
         Queries the printer for its status, and returns an array of integers containing it.
+        Returns as soon as the printer answers; the array is empty if it did not answer in time.
         :param mode: Integer that sets the status mode queried to the printer.
             - RT_STATUS_ONLINE: Printer status.
             - RT_STATUS_PAPER: Paper sensor.
+        :param timeout: Time in seconds to wait for the answer, *default*: 1
         :rtype: array(integer)
         """
         self._raw(mode)
-        time.sleep(1)
-        status = self._read()
+        self.flush()
+        if self._corked:
+            # Push the request out now instead of letting TCP_CORK hold it back, then resume the job
+            self._uncork()
+            self.begin_job()
+        self.device.settimeout(timeout)
+        try:
+            status = self._read()
+        except socket.timeout:
+            status = b""
+        finally:
+            self.device.settimeout(self.timeout)
         return status
 
     def is_online(self):
@@ -212,10 +444,7 @@ class NetworkPrinter(object):
         :returns: When online, returns ``True``; ``False`` otherwise.
         :rtype: bool
         """
-        status = self.query_status(RT_STATUS_ONLINE)
-        if len(status) == 0:
-            return False
-        return not (status[0] & RT_MASK_ONLINE)
+        return self._online_status(self.query_status(RT_STATUS_ONLINE))
 
     def paper_status(self):
         """
@@ -225,16 +454,110 @@ class NetworkPrinter(object):
         :returns: 2: Paper is adequate. 1: Paper ending. 0: No paper.
         :rtype: int
         """
-        status = self.query_status(RT_STATUS_PAPER)
-        if len(status) == 0:
-            return 2
-        if status[0] & RT_MASK_NOPAPER == RT_MASK_NOPAPER:
-            return 0
-        if status[0] & RT_MASK_LOWPAPER == RT_MASK_LOWPAPER:
-            return 1
-        if status[0] & RT_MASK_PAPER == RT_MASK_PAPER:
-            return 2
+        return self._paper_status(self.query_status(RT_STATUS_PAPER))
+
+    def __enter__(self):
+        return self
 
     def __exit__(self, type, value, traceback):
-        if self.autoclose:
-            self.close()
\ No newline at end of file
+        self.close()
+
+
+class AsyncNetworkPrinter(_BasePrinter):
+    """Network printer for asyncio
+
+    Offers the same commands as :py:class:`NetworkPrinter`. Only the methods talking to the
+    printer are coroutines: :py:meth:`open`, :py:meth:`flush`, :py:meth:`cut`, :py:meth:`close`
+    and the status queries. Many printers can be served concurrently from one event loop.
+    """
+
+    def __init__(self, host: str, port: int = 9100, timeout: int = 30, codepage: str = 'cp866'):
+        """
+        The connection is made by :py:meth:`open`, or when entering ``async with``.
+
+        :param host:    Printer's hostname or IP address
+        :param port:    Port to write to
+        :param timeout: Timeout in seconds for connecting
+        :param codepage: Default: cp866
+        """
+        super(AsyncNetworkPrinter, self).__init__(host, port, timeout, codepage)
+        self._reader = None
+        self._writer = None
+
+    async def open(self):
+        """Open TCP connection with ``asyncio`` streams
+
+        :raises: :py:exc:`OSError` if the printer cannot be reached
+        """
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+
+    async def flush(self):
+        """Send all queued commands to the printer and wait until they are written
+        :raises: :py:exc:`ConnectionError` if the connection is not open
+        """
+        if self._writer is None:
+            raise ConnectionError("Printer connection is not open")
+        if self._frags:
+            self._writer.writelines(self._frags)
+            self._frags.clear()
+        await self._writer.drain()
+
+    async def close(self):
+        """Send the queued commands, then close TCP connection"""
+        if self._writer is not None:
+            try:
+                await self.flush()
+            finally:
+                self._writer.close()
+                try:
+                    await self._writer.wait_closed()
+                except OSError:
+                    pass
+                self._reader = self._writer = None
+
+    async def cut(self, mode: str):
+        """Cut paper and flush everything queued so far, see :py:meth:`NetworkPrinter.cut`
+        :param mode: set to 'PART' for a partial cut
+        """
+        self._queue_cut(mode)
+        await self.flush()
+
+    async def query_status(self, mode, timeout: float = 1.0):
+        """
+        Queries the printer for its status, see :py:meth:`NetworkPrinter.query_status`
+        :param mode: Integer that sets the status mode queried to the printer.
+        :param timeout: Time in seconds to wait for the answer, *default*: 1
+        :rtype: array(integer)
+        """
+        self._raw(mode)
+        await self.flush()
+        try:
+            return await asyncio.wait_for(self._reader.read(16), timeout)
+        except asyncio.TimeoutError:
+            return b""
+
+    async def is_online(self):
+        """
+        Queries the online status of the printer.
+        :returns: When online, returns ``True``; ``False`` otherwise.
+        :rtype: bool
+        """
+        return self._online_status(await self.query_status(RT_STATUS_ONLINE))
+
+    async def paper_status(self):
+        """
+        Queries the paper status of the printer.
+        :returns: 2: Paper is adequate. 1: Paper ending. 0: No paper.
+        :rtype: int
+        """
+        return self._paper_status(await self.query_status(RT_STATUS_PAPER))
+
+    async def __aenter__(self):
+        if self._writer is None:
+            await self.open()
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        await self.close()
\ No newline at end of file
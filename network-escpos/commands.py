@@ -8,8 +8,6 @@
 """
 
 
-import six
-
 # Control characters
 # as labelled in https://www.novopos.ch/client/EPSON/TM-T20/TM-T20_eng_qr.pdf
 NUL = b"\x00"
@@ -39,14 +37,14 @@ HW_RESET = ESC + b"\x3f\x0a\x00"  # Reset printer hardware
 
 # Cash Drawer (ESC p <pin> <on time: 2*ms> <off time: 2*ms>)
 _CASH_DRAWER = (
-    lambda m, t1="", t2="": ESC + b"p" + m + six.int2byte(t1) + six.int2byte(t2)
+    lambda m, t1="", t2="": ESC + b"p" + m + bytes((t1,)) + bytes((t2,))
 )
 CD_KICK_DEC_SEQUENCE = (
-    lambda esc, p, m, t1=50, t2=50: six.int2byte(esc)
-    + six.int2byte(p)
-    + six.int2byte(m)
-    + six.int2byte(t1)
-    + six.int2byte(t2)
+    lambda esc, p, m, t1=50, t2=50: bytes((esc,))
+    + bytes((p,))
+    + bytes((m,))
+    + bytes((t1,))
+    + bytes((t2,))
 )
 CD_KICK_2 = _CASH_DRAWER(b"\x00", 50, 50)  # Sends a pulse to pin 2 []
 CD_KICK_5 = _CASH_DRAWER(b"\x01", 50, 50)  # Sends a pulse to pin 5 []
@@ -60,7 +58,7 @@ PAPER_PART_CUT = _CUT_PAPER(b"\x01")  # Partial cut paper
 BEEP = b"\x07"
 
 # Panel buttons (e.g. the FEED button)
-_PANEL_BUTTON = lambda n: ESC + b"c5" + six.int2byte(n)
+_PANEL_BUTTON = lambda n: ESC + b"c5" + bytes((n,))
 PANEL_BUTTON_ON = _PANEL_BUTTON(0)  # enable all panel buttons
 PANEL_BUTTON_OFF = _PANEL_BUTTON(1)  # disable all panel buttons
 
@@ -188,7 +186,7 @@ BARCODE_WIDTH = GS + b"w"  # Barcode Width  [2-6]
 #      -  Type A: "GS k <type as integer> <data> NUL"
 #      -  TYPE B: "GS k <type as letter> <data length> <data>"
 #      The latter command supports more barcode types
-_SET_BARCODE_TYPE = lambda m: GS + b"k" + six.int2byte(m)
+_SET_BARCODE_TYPE = lambda m: GS + b"k" + bytes((m,))
 
 # Barcodes for printing function type A
 BARCODE_TYPE_A = {